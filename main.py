@@ -27,11 +27,17 @@ This will analyse all Python and JavaScript files in ``my_project``.
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
 import os
-from typing import List
+from typing import Dict, List
 
-from .metrics import FileMetrics, analyse_directory
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to the standard library
+    orjson = None
+
+from .metrics import CACHE_FILENAME, FileMetrics, analyse_directory
 from .principles import evaluate_solid, evaluate_functional
 
 
@@ -45,17 +51,27 @@ def human_readable_summary(files: List[FileMetrics]) -> str:
         A formatted string describing per‑file metrics and overall statistics.
     """
     lines: List[str] = []
-    total_functions = sum(fm.num_functions for fm in files)
-    total_classes = sum(fm.num_classes for fm in files)
-    total_complexity = sum(fm.cyclomatic_complexity for fm in files)
+    total_functions = 0
+    total_classes = 0
+    total_complexity = 0
     total_files = len(files)
-    total_lines = sum(fm.line_count for fm in files)
-    total_comments = sum(fm.comment_count for fm in files)
-    total_long_lines = sum(fm.long_line_count for fm in files)
-    mixed_indent_files = sum(1 for fm in files if fm.mixed_indent)
+    total_lines = 0
+    total_comments = 0
+    total_long_lines = 0
+    mixed_indent_files = 0
 
     lines.append("\nAnalysis Summary:\n" + "=" * 70)
     for fm in files:
+        # Accumulate the overall totals in the same pass as the per-file report.
+        total_functions += fm.num_functions
+        total_classes += fm.num_classes
+        total_complexity += fm.cyclomatic_complexity
+        total_lines += fm.line_count
+        total_comments += fm.comment_count
+        total_long_lines += fm.long_line_count
+        if fm.mixed_indent:
+            mixed_indent_files += 1
+
         lines.append(f"File: {fm.path}")
         lines.append(f"  Language               : {fm.language}")
         lines.append(f"  Functions              : {fm.num_functions}")
@@ -89,24 +105,82 @@ def human_readable_summary(files: List[FileMetrics]) -> str:
     return "\n".join(lines)
 
 
+def write_json(
+    path: str,
+    files: List[FileMetrics],
+    solid_scores: Dict[str, float],
+    functional_scores: Dict[str, float],
+) -> None:
+    """Write the analysis results to a JSON file.
+
+    When ``orjson`` is installed it serialises the ``FileMetrics`` objects
+    directly.  Otherwise, or when ``orjson`` rejects the data (for example a
+    path holding surrogate escapes from a file name that is not valid UTF-8),
+    each file's metrics are streamed to disk one at a time with the standard
+    ``json`` module, so the full list of dictionaries is never built in
+    memory.
+
+    Args:
+        path: Destination file path.
+        files: List of file metrics.
+        solid_scores: Scores returned by ``evaluate_solid``.
+        functional_scores: Scores returned by ``evaluate_functional``.
+    """
+    if orjson is not None:
+        data = {
+            "files": files,
+            "solid_scores": solid_scores,
+            "functional_scores": functional_scores,
+        }
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            with open(path, "wb") as f:
+                f.write(encoded)
+            return
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "files": [')
+        for i, fm in enumerate(files):
+            f.write(",\n    " if i else "\n    ")
+            json.dump(dataclasses.asdict(fm), f)
+        f.write('\n  ],\n  "solid_scores": ')
+        json.dump(solid_scores, f)
+        f.write(',\n  "functional_scores": ')
+        json.dump(functional_scores, f)
+        f.write("\n}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Analyse source code for complexity, style and design principles.")
     parser.add_argument("--path", required=True, help="Directory path to analyse")
     parser.add_argument("--json", help="Save analysis results to a JSON file")
     parser.add_argument("--extensions", nargs="*", help="List of file extensions to include (e.g. .py .js)")
+    parser.add_argument("--jobs", type=int, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--cache", action="store_true",
+                        help=f"Cache per-file metrics in {CACHE_FILENAME} inside the analysed directory")
     args = parser.parse_args()
 
     if not os.path.isdir(args.path):
         raise SystemExit(f"Error: path '{args.path}' does not exist or is not a directory")
+    if args.jobs is not None and args.jobs < 1:
+        raise SystemExit(f"Error: --jobs must be at least 1, got {args.jobs}")
 
-    files: List[FileMetrics] = analyse_directory(args.path, extensions=args.extensions)
+    cache_path = os.path.join(args.path, CACHE_FILENAME) if args.cache else None
+    files: List[FileMetrics] = analyse_directory(
+        args.path, extensions=args.extensions, max_workers=args.jobs, cache_path=cache_path
+    )
     if not files:
         print("No source files found to analyse.")
         return
 
     # Evaluate principles
-    solid_scores = evaluate_solid(files)
-    functional_scores = evaluate_functional(files)
+    # Share the file contents read by the evaluators for this run only.
+    sources: Dict[str, bytes] = {}
+    solid_scores = evaluate_solid(files, sources)
+    functional_scores = evaluate_functional(files, sources)
 
     # Print summary
     print(human_readable_summary(files))
@@ -119,14 +193,8 @@ def main() -> None:
 
     # Optionally write JSON
     if args.json:
-        data = {
-            "files": [fm.__dict__ for fm in files],
-            "solid_scores": solid_scores,
-            "functional_scores": functional_scores,
-        }
         try:
-            with open(args.json, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            write_json(args.json, files, solid_scores, functional_scores)
             print(f"\nResults written to {args.json}")
         except Exception as exc:
             print(f"Failed to write JSON file: {exc}")
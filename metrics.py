@@ -35,15 +35,80 @@ programming practices.
 
 from __future__ import annotations
 
+import json
+import mmap
 import os
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-
-
-@dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Union
+
+# A single multi-pattern regular expression used to scan a whole file in one
+# pass.  It operates on raw bytes so it can run directly over a memory-mapped
+# file.  The line-start alternatives share a single ``^`` anchor so the engine
+# only evaluates them at the beginning of a line.  The leading lookahead lists
+# every character a match can start with (whitespace before an indented
+# declaration, comment tokens and the first letter of each keyword); it
+# rejects most positions with one character-class test instead of trying each
+# alternative in turn.  Each match reports its kind through the name of the
+# group that matched:
+#
+# * ``comment`` – a line starting with a comment token.
+# * ``func``, ``cls`` and ``iface`` – lines starting with a function, class or
+#   interface keyword.  Functions are also recognised by a leading access or
+#   storage modifier (``public static void main(``, as in Java or C#) as long
+#   as only type and name tokens precede the opening parenthesis on the same
+#   line; a bare ``private`` line (as in Ruby) is not a declaration.  Function
+#   lines must contain an opening parenthesis; the lookahead checks for it
+#   without consuming the line so decision keywords following the
+#   declaration are still counted.
+# * ``dec`` – decision and loop constructs across several languages.  Each
+#   occurrence adds one to the complexity count.  Word boundaries avoid false
+#   positives (e.g. matching ``if`` inside ``diff``).
+_LINE_RE = re.compile(
+    rb"(?=[\s#/*\-acdefiopsw&|?])"
+    rb"(?:^[^\S\n]*(?:(?P<comment>#|//|/\*|\*|--)"
+    rb"|(?P<func>(?:def|function|func)\b(?=[^\n]*\()"
+    rb"|(?:public|private|protected|static|final)\b(?=[\w \t<>\[\],.]*\())"
+    rb"|(?P<cls>(?:class|struct)\b)"
+    rb"|(?P<iface>interface\b))"
+    rb"|(?P<dec>\b(?:if|elif|for|while|case|switch|catch|except|and|or)\b|else\s+if|&&|\|\||\?))",
+    re.MULTILINE,
+)
+
+# File name of the optional metrics cache written by ``analyse_directory``.
+# Bump ``_CACHE_VERSION`` whenever the analysis changes so stale caches are
+# discarded.
+CACHE_FILENAME = ".code_analyzer_cache.json"
+_CACHE_VERSION = 4
+
+# Files at least this large are memory-mapped rather than read into memory.
+_MMAP_THRESHOLD = 1 << 20
+
+# Recognised file extensions and their languages.  ``analyse_directory``
+# filters lower-cased file names against ``_DEFAULT_EXTENSIONS`` with a single
+# ``str.endswith`` call, matching the case-insensitive ``detect_language``.
+_LANGUAGES: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".cs": "csharp",
+    ".ts": "typescript",
+    ".rb": "ruby",
+    ".go": "go",
+}
+_DEFAULT_EXTENSIONS = tuple(_LANGUAGES)
+
+
+@dataclass(slots=True)
 class FileMetrics:
-    """A container for the metrics of a single source file."""
+    """A container for the metrics of a single source file.
+
+    Instances use ``__slots__`` to keep their footprint small, since one is
+    created per analysed file.
+    """
 
     path: str
     num_functions: int = 0
@@ -83,177 +148,337 @@ def detect_language(filename: str) -> str:
         A string describing the language, e.g. ``'python'`` or ``'javascript'``.
     """
     ext = os.path.splitext(filename)[1].lower()
-    return {
-        ".py": "python",
-        ".js": "javascript",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".cs": "csharp",
-        ".ts": "typescript",
-        ".rb": "ruby",
-        ".go": "go",
-    }.get(ext, "unknown")
-
-
-def count_patterns(patterns: List[str], line: str) -> int:
-    """Count occurrences of any of the patterns in a line.
-
-    The search is case sensitive and looks for whole words.  Simple regular
-    expressions are used to avoid false positives (e.g. matching ``if`` inside
-    ``diff``).
+    return _LANGUAGES.get(ext, "unknown")
+
+
+def read_source(path: str) -> Union[bytes, mmap.mmap]:
+    """Return the raw contents of a source file.
+
+    Small files are read into a ``bytes`` object.  Files of at least
+    ``_MMAP_THRESHOLD`` bytes are memory-mapped read-only instead, so large
+    generated sources are scanned in place rather than copied; callers should
+    close the returned mapping when done.
 
     Args:
-        patterns: A list of keywords to search for.
-        line: The line of text.
+        path: The path to the file.
 
     Returns:
-        The number of occurrences of any keyword in the line.
+        The file contents as ``bytes`` or a read-only ``mmap.mmap``.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
     """
-    count = 0
-    for kw in patterns:
-        # Use word boundaries to avoid matching substrings inside other words.
-        if re.search(r"\b" + re.escape(kw) + r"\b", line):
-            count += 1
-    return count
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
 
 
-def analyse_file(path: str) -> Optional[FileMetrics]:
+def iter_lines(data: Union[bytes, mmap.mmap]) -> Iterator[bytes]:
+    """Yield the lines of a buffer returned by ``read_source``.
+
+    Lines are yielded without their trailing newline.  A memory-mapped file is
+    read one line at a time so the whole file is never copied.
+
+    Args:
+        data: The file contents.
+
+    Yields:
+        Each line of the file.
+    """
+    if isinstance(data, mmap.mmap):
+        data.seek(0)
+        for line in iter(data.readline, b""):
+            yield line[:-1] if line.endswith(b"\n") else line
+        return
+    lines = data.split(b"\n")
+    if not lines[-1]:
+        lines.pop()
+    yield from lines
+
+
+def analyse_file(path: str, language: Optional[str] = None) -> Optional[FileMetrics]:
     """Analyse a single source file and return metrics.
 
-    The function reads the file line by line.  It counts function, class and
-    interface declarations using simple regular expressions, estimates
-    cyclomatic complexity by counting branching keywords and loops, detects
-    style violations like mixed indentation and overly long lines, and gathers
-    additional lightweight statistics.
+    The function reads the whole file and scans it with a single regular
+    expression.  It counts function, class and interface declarations,
+    estimates cyclomatic complexity by counting branching keywords and loops,
+    detects style violations like mixed indentation and overly long lines, and
+    gathers additional lightweight statistics.
 
     Args:
         path: The path to the file.
+        language: The file's language as returned by ``detect_language``.
+            Detected from ``path`` when omitted.
 
     Returns:
         A ``FileMetrics`` instance with the collected data.  If the file cannot
         be read (e.g. binary files), ``None`` is returned.
     """
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
+        data = read_source(path)
     except Exception:
         return None
+    try:
+        return _analyse_source(path, language or detect_language(path), data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
 
-    metrics = FileMetrics(path=path)
-    metrics.language = detect_language(path)
-    indent_char: Optional[str] = None  # Track whether indentation uses spaces or tabs
-    complexity = 1  # baseline complexity per McCabe
 
-    # Define patterns to look for when estimating complexity.  Each occurrence
-    # adds one to the complexity count.  The list covers common decision and
-    # loop constructs across several languages.
-    decision_keywords = [
-        "if", "elif", "else if", "for", "while", "case", "switch",
-        "catch", "except", "&&", "||", "?", "and", "or",
-    ]
-
-    # Patterns for detecting function, class and interface definitions.  These
-    # patterns are deliberately broad to work on multiple languages.  They
-    # primarily look for lines that start with the keyword and contain an
-    # opening parenthesis (for functions) or do not (for classes).
-    function_patterns = [
-        re.compile(r"^\s*(def|function|func|public\s+static|private\s+static|"  # Python, JS
-                    r"public|private|protected|static|final)?\s*\w+\s*\(.*\)"),
-    ]
-    class_patterns = [
-        re.compile(r"^\s*(class|struct)\b"),
-    ]
-    interface_patterns = [
-        re.compile(r"^\s*interface\b"),
-    ]
-
-    for line in lines:
-        metrics.line_count += 1
-        stripped = line.strip()
-
-        # Count comments: lines starting with comment tokens.
-        if stripped.startswith("#") or stripped.startswith("//") or \
-           stripped.startswith("/*") or stripped.startswith("*") or \
-           stripped.startswith("--"):
-            metrics.comment_count += 1
-
-        # Track indentation style for Python; check if spaces or tabs are mixed.
-        if metrics.language == "python":
-            match = re.match(r"^(\s+)", line)
-            if match:
-                current_indent = match.group(1)
-                current_char = current_indent[0]
+def _analyse_source(path: str, language: str, data: Union[bytes, mmap.mmap]) -> FileMetrics:
+    """Collect the metrics for ``analyse_file`` from the file's raw contents."""
+    indent_char: Optional[bytes] = None  # Track whether indentation uses spaces or tabs
+    complexity = 1  # baseline complexity per McCabe
+    comment_count = 0
+    num_functions = 0
+    num_classes = 0
+    num_interfaces = 0
+    mixed_indent = False
+
+    # Count comments, declarations and decision keywords in a single pass
+    # over the file.  Line-start alternatives are mutually exclusive, so each
+    # line is counted at most once as a comment or declaration.  Counters are
+    # kept in local variables and only stored on the result once at the end.
+    for match in _LINE_RE.finditer(data):
+        kind = match.lastgroup
+        if kind == "dec":
+            complexity += 1
+        elif kind == "comment":
+            comment_count += 1
+        elif kind == "func":
+            num_functions += 1
+        elif kind == "cls":
+            num_classes += 1
+        else:
+            num_interfaces += 1
+
+    line_count = 0
+    long_line_count = 0
+    is_python = language == "python"
+    for line in iter_lines(data):
+        line_count += 1
+
+        # Count lines exceeding 79 characters in any language (PEP 8 suggests
+        # limiting lines to 79 characters【263717488702505†L234-L249】).  Lines
+        # are measured in bytes first and only longer ones are decoded, so
+        # multi-byte characters and CRLF endings are not over-counted.
+        if len(line) > 79 and len(line.rstrip(b"\r").decode("utf-8", "ignore")) > 79:
+            long_line_count += 1
+
+        # Track indentation style for Python; check if spaces or tabs are
+        # mixed.  Once both have been seen the rest of the file cannot change
+        # the result.
+        if is_python and not mixed_indent:
+            current_char = line[:1]
+            if current_char == b" " or current_char == b"\t":
                 if indent_char is None:
                     indent_char = current_char
                 elif current_char != indent_char:
-                    metrics.mixed_indent = True
-
-        # Count lines exceeding 79 characters in any language (PEP 8 suggests
-        # limiting lines to 79 characters【263717488702505†L234-L249】).
-        if len(line.rstrip("\n")) > 79:
-            metrics.long_line_count += 1
-
-        # Count functions/classes/interfaces using regex patterns.  We only
-        # increment once per line even if multiple patterns match.
-        for pattern in function_patterns:
-            if pattern.match(line):
-                metrics.num_functions += 1
-                break
-        for pattern in class_patterns:
-            if pattern.match(line):
-                metrics.num_classes += 1
-                break
-        for pattern in interface_patterns:
-            if pattern.match(line):
-                metrics.num_interfaces += 1
-                break
-
-        # Estimate cyclomatic complexity: add one for each decision keyword.
-        complexity += count_patterns(decision_keywords, line)
-
-    metrics.cyclomatic_complexity = complexity
-
-    # Map complexity to risk categories based on Tom McCabe's original
+                    mixed_indent = True
+
+    # Map complexity to risk categories based on Tom McCabe's original
     # classification【733509849101575†L249-L253】.
     if complexity <= 10:
-        metrics.complexity_category = "Simple"
+        complexity_category = "Simple"
     elif complexity <= 20:
-        metrics.complexity_category = "Moderate"
+        complexity_category = "Moderate"
     elif complexity <= 50:
-        metrics.complexity_category = "Complex"
+        complexity_category = "Complex"
     else:
-        metrics.complexity_category = "Very High"
+        complexity_category = "Very High"
+
+    return FileMetrics(
+        path=path,
+        num_functions=num_functions,
+        num_classes=num_classes,
+        num_interfaces=num_interfaces,
+        cyclomatic_complexity=complexity,
+        complexity_category=complexity_category,
+        line_count=line_count,
+        comment_count=comment_count,
+        long_line_count=long_line_count,
+        mixed_indent=mixed_indent,
+        language=language,
+    )
+
+
+def _analyse_paths(
+    paths: List[str], languages: List[str], max_workers: Optional[int]
+) -> List[Optional[FileMetrics]]:
+    """Run ``analyse_file`` over ``paths``, in parallel when worthwhile.
+
+    The result list is aligned with ``paths``; unreadable files yield ``None``.
+    """
+    if max_workers == 1 or len(paths) <= 1:
+        return [analyse_file(p, lang) for p, lang in zip(paths, languages)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(analyse_file, paths, languages, chunksize=16))
+
+
+def _load_cache(cache_path: str) -> Dict[str, dict]:
+    """Load cached per-file metrics, ignoring missing or outdated caches.
+
+    A cache that is not shaped as written by ``_save_cache`` is treated like a
+    missing one, and entries that are not objects are dropped, so a damaged
+    cache only costs a re-analysis.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {path: entry for path, entry in files.items() if isinstance(entry, dict)}
+
+
+def _save_cache(cache_path: str, entries: Dict[str, dict]) -> None:
+    """Write cached per-file metrics, replacing the previous cache atomically."""
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _CACHE_VERSION, "files": entries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is only an optimisation; failing to write it is not fatal.
+        pass
+
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """Recursively yield the regular files below ``root``.
 
-    return metrics
+    ``os.scandir`` entries carry the file type reported by the directory
+    listing, so no extra ``stat`` call is needed to tell files from
+    directories, and their ``stat()`` result is cached for later use.  Files
+    are yielded in the same order as ``os.walk``: the files of a directory
+    first, then those of each subdirectory.  Symbolic links to directories are
+    not followed and unreadable directories are skipped.
 
+    Args:
+        root: The directory to search.
 
-def analyse_directory(path: str, extensions: Optional[List[str]] = None) -> List[FileMetrics]:
+    Yields:
+        A ``DirEntry`` for each file.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    subdirs: List[str] = []
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                is_file = entry.is_file()
+            except OSError:
+                continue
+            if is_file:
+                yield entry
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
+def analyse_directory(
+    path: str,
+    extensions: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+) -> List[FileMetrics]:
     """Recursively analyse all source files in a directory.
 
+    Files are analysed in parallel using a pool of worker processes, since
+    each file is independent and the regex scanning in ``analyse_file`` is
+    CPU bound.
+
+    When ``cache_path`` is given, metrics are memoised in a JSON file keyed by
+    each file's path, modification time and size.  Unchanged files are loaded
+    from the cache instead of being analysed again; edited files are detected
+    by their new modification time or size and re-analysed.
+
     Args:
         path: Root directory to search.
         extensions: Optional list of file extensions to include.  When not
-            provided, all files with a recognized language extension are
-            analysed.
+            provided (or empty), all files with a recognized language
+            extension are analysed.
+        max_workers: Maximum number of worker processes.  Defaults to the
+            number of CPUs; ``1`` analyses the files in the current process.
+        cache_path: Optional path of a JSON file used to cache metrics between
+            runs.
 
     Returns:
         A list of ``FileMetrics`` objects, one per analysed file.  Files that
         cannot be read or whose language is unknown are skipped.
     """
-    results: List[FileMetrics] = []
-    for root, _, files in os.walk(path):
-        for fname in files:
-            file_path = os.path.join(root, fname)
+    # Filter on the extension before touching the file; only matching names
+    # have their language detected, once, and passed on to ``analyse_file``.
+    # Without an explicit filter a name must also have a stem, so a dotfile
+    # such as ``.py`` is skipped as an unknown language.
+    # The cache and its temporary file may live inside the analysed tree;
+    # they are never analysed themselves.
+    allowed = tuple(extensions) if extensions else None
+    skip_paths = set()
+    if cache_path is not None:
+        skip_paths = {os.path.abspath(cache_path), os.path.abspath(cache_path + ".tmp")}
+    skip_names = {os.path.basename(p) for p in skip_paths}
+    entries: List[os.DirEntry] = []
+    languages: List[str] = []
+    for entry in _iter_files(path):
+        fname = entry.name
+        if fname in skip_names and os.path.abspath(entry.path) in skip_paths:
+            continue
+        if allowed is not None:
+            if not fname.endswith(allowed):
+                continue
             lang = detect_language(fname)
-            # Skip unknown languages unless no extension filter is provided.
-            if extensions is not None:
-                if not any(fname.endswith(ext) for ext in extensions):
-                    continue
-            else:
-                if lang == "unknown":
-                    continue
-            metrics = analyse_file(file_path)
-            if metrics is not None:
-                results.append(metrics)
-    return results
+        else:
+            if not fname.lower().endswith(_DEFAULT_EXTENSIONS):
+                continue
+            lang = detect_language(fname)
+            if lang == "unknown":
+                continue
+        entries.append(entry)
+        languages.append(lang)
+    paths = [entry.path for entry in entries]
+
+    if cache_path is None:
+        results = _analyse_paths(paths, languages, max_workers)
+        return [metrics for metrics in results if metrics is not None]
+
+    cache = _load_cache(cache_path)
+    results: List[Optional[FileMetrics]] = [None] * len(paths)
+    keys: Dict[str, List[int]] = {}
+    pending: List[int] = []
+    for i, entry in enumerate(entries):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        key = [st.st_mtime_ns, st.st_size]
+        keys[entry.path] = key
+        cached = cache.get(entry.path)
+        if cached is not None and cached.get("key") == key:
+            try:
+                results[i] = FileMetrics(**cached["metrics"])
+                continue
+            except (KeyError, TypeError):
+                pass
+        pending.append(i)
+
+    analysed = _analyse_paths(
+        [paths[i] for i in pending], [languages[i] for i in pending], max_workers
+    )
+    for i, metrics in zip(pending, analysed):
+        results[i] = metrics
+
+    _save_cache(cache_path, {
+        metrics.path: {"key": keys[metrics.path], "metrics": asdict(metrics)}
+        for metrics in results
+        if metrics is not None
+    })
+    return [metrics for metrics in results if metrics is not None]
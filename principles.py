@@ -35,13 +35,95 @@ for assignments which indicate mutable state.
 
 from __future__ import annotations
 
+import mmap
 import re
-from typing import Dict, List
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
 
-from .metrics import FileMetrics
+from .metrics import FileMetrics, iter_lines, read_source
 
+# All patterns operate on raw bytes: the tokens they look for are ASCII, so
+# files never need to be decoded.
+#
+# Patterns used by ``evaluate_solid``.  Inheritance is matched by patterns like
+# ``class Foo extends Bar`` (Java, JS) or ``class Foo : Bar`` (C++).
+_INHERIT_RE = re.compile(rb"class\s+\w+\s*(?:extends|:)\s+\w+")
+_IFACE_BODY_RE = re.compile(rb"interface\s+\w+\s*{([^}]*)}", re.MULTILINE | re.DOTALL)
+_METHOD_RE = re.compile(rb"\b\w+\s*\(.*?\)\s*;")
+# Import statements are recognised by their leading keyword.  A prefix test
+# on the stripped line rejects most lines cheaply; only candidates are matched
+# against ``_IMPORT_RE`` to check the word boundary, so forms such as
+# ``import{a} from 'b'`` and a bare ``import`` still count.
+_IMPORT_PREFIXES = (b"import", b"using", b"require")
+_IMPORT_RE = re.compile(rb"(?:import|using|require)\b")
 
-def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
+# Patterns used by ``evaluate_functional``.  Print/log statements are plain
+# substrings, so they are found with ``find`` rather than a regex search.
+_PRINT_MARKERS = (b"print(", b"console.log", b"System.out.println")
+_LAMBDA_RE = re.compile(rb"\blambda\b|=>")
+_HOF_RE = re.compile(rb"\b(map|filter|reduce|fold|forEach)\b")
+_IMMUT_RE = re.compile(rb"\b(const|final|immutable)\b")
+
+
+@contextmanager
+def _open_source(
+    path: str, sources: Optional[Dict[str, bytes]] = None
+) -> Iterator[Optional[Union[bytes, mmap.mmap]]]:
+    """Provide the raw contents of a source file, reading it at most once.
+
+    Both ``evaluate_solid`` and ``evaluate_functional`` scan the full contents
+    of every analysed file.  When the caller passes the same ``sources`` dict
+    to both, files read into memory are kept there so each is read only once
+    per analysis; the cache lives only as long as that dict.  Large files are
+    memory-mapped by ``metrics.read_source``; mappings are not cached and are
+    closed when the ``with`` block exits.
+
+    Args:
+        path: The path to the file.
+        sources: Optional cache of file contents keyed by path.
+
+    Yields:
+        The file contents, or ``None`` if the file cannot be read.
+    """
+    data: Optional[Union[bytes, mmap.mmap]] = None
+    try:
+        data = sources.get(path) if sources is not None else None
+        if data is None:
+            data = read_source(path)
+            if sources is not None and isinstance(data, bytes):
+                sources[path] = data
+    except Exception:
+        data = None
+    try:
+        yield data
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def _count_assignments(data: Union[bytes, mmap.mmap]) -> int:
+    """Count the lines of a source file containing an assignment.
+
+    A line counts when it contains ``=`` before any ``#`` comment marker.
+    Plain substring searches are used since no pattern matching is needed.
+
+    Args:
+        data: The file contents.
+
+    Returns:
+        The number of lines with an assignment.
+    """
+    count = 0
+    for line in iter_lines(data):
+        eq = line.find(b"=")
+        if eq >= 0 and line.find(b"#", 0, eq) < 0:
+            count += 1
+    return count
+
+
+def evaluate_solid(
+    files: List[FileMetrics], sources: Optional[Dict[str, bytes]] = None
+) -> Dict[str, float]:
     """Evaluate SOLID adherence based on file metrics.
 
     The heuristics implemented here operate on aggregated statistics:
@@ -63,6 +145,8 @@ def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
 
     Args:
         files: A list of ``FileMetrics`` produced by ``metrics.analyse_directory``.
+        sources: Optional dict used to cache file contents; pass the same dict
+            to ``evaluate_functional`` to read each file only once.
 
     Returns:
         A dictionary mapping principle names to heuristic scores between 0 and 1.
@@ -72,6 +156,7 @@ def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
     classes_with_inheritance = 0
     total_interfaces = 0
     interface_methods = 0
+    total_imports = 0
     uses_abstract_in_imports = 0
 
     for fm in files:
@@ -79,25 +164,22 @@ def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
         total_functions += fm.num_functions
         total_interfaces += fm.num_interfaces
         # Rough inheritance detection: scan file text for "extends" or ":" after class
-        try:
-            with open(fm.path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-        except Exception:
-            text = ""
-        # Count classes with inheritance by matching patterns like
-        # ``class Foo extends Bar`` (Java, JS) or ``class Foo : Bar`` (C++)
-        inheritance_pattern = re.compile(r"class\s+\w+\s*(?:extends|:)\s+\w+", re.IGNORECASE)
-        classes_with_inheritance += len(inheritance_pattern.findall(text))
-        # Extract interface definitions to count methods
-        interface_pattern = re.compile(r"interface\s+\w+\s*{([^}]*)}", re.MULTILINE | re.DOTALL)
-        for match in interface_pattern.findall(text):
-            methods = re.findall(r"\b\w+\s*\(.*?\)\s*;", match)
-            interface_methods += len(methods)
-        # Count import lines mentioning abstractions
-        for line in text.splitlines():
-            if re.match(r"\s*(import|using|require)\b", line):
-                if re.search(r"(interface|abstract)", line, re.IGNORECASE):
-                    uses_abstract_in_imports += 1
+        with _open_source(fm.path, sources) as data:
+            if data is None:
+                continue
+            # Count classes with inheritance
+            classes_with_inheritance += len(_INHERIT_RE.findall(data))
+            # Extract interface definitions to count methods
+            for match in _IFACE_BODY_RE.findall(data):
+                interface_methods += len(_METHOD_RE.findall(match))
+            # Count import lines, and those mentioning abstractions
+            for line in iter_lines(data):
+                stripped = line.lstrip()
+                if stripped.startswith(_IMPORT_PREFIXES) and _IMPORT_RE.match(stripped):
+                    total_imports += 1
+                    lowered = stripped.lower()
+                    if b"interface" in lowered or b"abstract" in lowered:
+                        uses_abstract_in_imports += 1
 
     srp_score = 1.0
     if total_classes > 0:
@@ -119,15 +201,6 @@ def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
         avg_interface_methods = interface_methods / total_interfaces
         isp_score = max(0.0, 1.0 - max(0, avg_interface_methods - 5) / 10)
     # Dependency inversion: presence of imports referencing abstractions increases score
-    total_imports = 0
-    for fm in files:
-        try:
-            with open(fm.path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    if re.match(r"\s*(import|using|require)\b", line):
-                        total_imports += 1
-        except Exception:
-            pass
     dip_score = (uses_abstract_in_imports / total_imports) if total_imports else 0.0
 
     # Liskov substitution principle cannot be inferred reliably; assign neutral score.
@@ -142,7 +215,9 @@ def evaluate_solid(files: List[FileMetrics]) -> Dict[str, float]:
     }
 
 
-def evaluate_functional(files: List[FileMetrics]) -> Dict[str, float]:
+def evaluate_functional(
+    files: List[FileMetrics], sources: Optional[Dict[str, bytes]] = None
+) -> Dict[str, float]:
     """Assess functional programming characteristics in the analysed files.
 
     The heuristics include:
@@ -163,42 +238,40 @@ def evaluate_functional(files: List[FileMetrics]) -> Dict[str, float]:
 
     Args:
         files: List of ``FileMetrics`` from the analysis.
+        sources: Optional dict used to cache file contents, shared with
+            ``evaluate_solid``.
 
     Returns:
         A dictionary containing scores (between 0 and 1) for purity,
         higher‑order usage and immutability.
     """
-    total_functions = sum(fm.num_functions for fm in files)
+    total_functions = 0
     pure_functions = 0
     higher_order_count = 0
     immutable_count = 0
     total_assignments = 0
 
-    assignment_pattern = re.compile(r"^[^#\n]*=", re.MULTILINE)
-    print_pattern = re.compile(r"\b(print|console\.log|System\.out\.println)\b")
-    lambda_pattern = re.compile(r"\blambda\b|=>")
-    hof_pattern = re.compile(r"\b(map|filter|reduce|fold|forEach)\b")
-    immutable_keywords = re.compile(r"\b(const|final|immutable)\b", re.IGNORECASE)
-
     for fm in files:
-        try:
-            with open(fm.path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-        except Exception:
-            continue
-        # Count assignments and print calls for purity detection
-        total_assignments += len(assignment_pattern.findall(text))
-        if fm.num_functions > 0:
-            # If no assignments or print statements exist in the file, assume all
-            # functions are pure.  Otherwise approximate purity by the ratio of
-            # non‑assignment lines to lines.
-            if total_assignments == 0 and not print_pattern.search(text):
-                pure_functions += fm.num_functions
-        # Count higher order functions
-        higher_order_count += len(lambda_pattern.findall(text))
-        higher_order_count += len(hof_pattern.findall(text))
-        # Count immutable declarations
-        immutable_count += len(immutable_keywords.findall(text))
+        total_functions += fm.num_functions
+        with _open_source(fm.path, sources) as data:
+            if data is None:
+                continue
+            # Count assignments and print calls for purity detection
+            file_assignments = _count_assignments(data)
+            if fm.num_functions > 0:
+                # If no assignments or print statements exist in the file, assume all
+                # functions are pure.  The print check is skipped when the file
+                # already has assignments.  The search starts explicitly at 0
+                # because ``mmap.find`` starts at the current position, which
+                # ``_count_assignments`` has left at the end of the mapping.
+                if file_assignments == 0 and all(data.find(m, 0) < 0 for m in _PRINT_MARKERS):
+                    pure_functions += fm.num_functions
+            total_assignments += file_assignments
+            # Count higher order functions
+            higher_order_count += len(_LAMBDA_RE.findall(data))
+            higher_order_count += len(_HOF_RE.findall(data))
+            # Count immutable declarations
+            immutable_count += len(_IMMUT_RE.findall(data))
 
     purity_score = (pure_functions / total_functions) if total_functions else 0.0
     hof_score = min(1.0, higher_order_count / max(1, total_functions))